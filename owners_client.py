@@ -85,28 +85,54 @@ class OwnersClient(object):
         """Get sorted list of owners for the given paths."""
         if not paths:
             return []
+        return self._ScoreOwners(self.BatchListOwners(paths), exclude)
+
+    def SuggestOwners(self, paths, exclude=None):
+        """Suggest a set of owners for the given paths."""
+        return self._SuggestOwners(self.BatchListOwners(paths), exclude)
+
+    def BatchSuggestOwners(self, paths_by_key, exclude=None):
+        """Suggest a set of owners for each of several groups of paths.
+
+        The owners of all paths are listed in a single batch, rather than one
+        batch per group as calling SuggestOwners for each group would.
+
+        Returns a dictionary {key: [owners]}.
+        """
+        owners_by_path = self.BatchListOwners(
+            {path
+             for paths in paths_by_key.values()
+             for path in paths})
+        return {
+            key: self._SuggestOwners(
+                {path: owners_by_path[path]
+                 for path in paths}, exclude)
+            for key, paths in paths_by_key.items()
+        }
+
+    def _ScoreOwners(self, owners_by_path, exclude=None):
+        """Get sorted list of owners given a dictionary {path: [owners]}."""
+        if not owners_by_path:
+            return []
         exclude = exclude or []
         owners = []
-        queues = self.BatchListOwners(paths).values()
+        queues = owners_by_path.values()
         for i in range(max(len(q) for q in queues)):
             for q in queues:
                 if i < len(q) and q[i] not in owners and q[i] not in exclude:
                     owners.append(q[i])
         return owners
 
-    def SuggestOwners(self, paths, exclude=None):
-        """Suggest a set of owners for the given paths."""
-        exclude = exclude or []
-
+    def _SuggestOwners(self, owners_by_path, exclude=None):
+        """Suggest a set of owners given a dictionary {path: [owners]}."""
         paths_by_owner = {}
-        owners_by_path = self.BatchListOwners(paths)
         for path, owners in owners_by_path.items():
             for owner in owners:
                 paths_by_owner.setdefault(owner, set()).add(path)
 
         selected = []
-        missing = set(paths)
-        for owner in self.ScoreOwners(paths, exclude=exclude):
+        missing = set(owners_by_path)
+        for owner in self._ScoreOwners(owners_by_path, exclude=exclude):
             missing_len = len(missing)
             missing.difference_update(paths_by_owner[owner])
             if missing_len > len(missing):
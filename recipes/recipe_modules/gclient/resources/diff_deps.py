@@ -9,9 +9,17 @@ if '@' in os.environ.get('GCLIENT_URL'):
 else:
   sys.exit(0)
 
-diff = subprocess.check_output("git diff --cached --name-only %s" % ref, shell=True)
-
 dep_path = os.environ.get('GCLIENT_DEP_PATH', '')
-for line in diff.splitlines():
+
+# Stream the diff rather than buffering it, so paths are printed as soon as git
+# produces them.
+# The trailing '--' makes git treat |ref| as a revision, never as a path.
+proc = subprocess.Popen(['git', 'diff', '--cached', '--name-only', ref, '--'],
+                        stdout=subprocess.PIPE)
+for line in proc.stdout:
+  line = line.rstrip(b'\n').decode('utf-8')
   if line:
     print(os.path.join(dep_path, line))
+proc.stdout.close()
+if proc.wait():
+  raise subprocess.CalledProcessError(proc.returncode, proc.args)
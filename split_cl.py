@@ -5,6 +5,7 @@
 """Splits a branch into smaller branches and uploads CLs."""
 
 import collections
+import heapq
 import os
 import re
 import subprocess2
@@ -27,6 +28,9 @@ CL_SPLIT_FORCE_LIMIT = 10
 # will be listed.
 CL_SPLIT_TOP_REVIEWERS = 5
 
+# Matches a bug link footer such as "Bug: 123" or "Bug: chromium:456".
+BUG_LINK_PATTERN = re.compile(r"^Bug:\s*(?:[a-zA-Z]+:)?[0-9]+", re.MULTILINE)
+
 FilesAndOwnersDirectory = collections.namedtuple("FilesAndOwnersDirectory",
                                                  "files owners_directories")
 
@@ -36,17 +40,19 @@ def EnsureInGitRepository():
     git.run('rev-parse')
 
 
-def CreateBranchForDirectories(prefix, directories, upstream):
+def CreateBranchForDirectories(prefix, directories, upstream,
+                               existing_branches):
     """Creates a branch named |prefix| + "_" + |directories[0]| + "_split".
 
     Return false if the branch already exists. |upstream| is used as upstream
-    for the created branch.
+    for the created branch. |existing_branches| is the set of local branch
+    names; the created branch is added to it.
     """
-    existing_branches = set(git.branches(use_limit=False))
     branch_name = prefix + '_' + directories[0] + '_split'
     if branch_name in existing_branches:
         return False
     git.run('checkout', '-t', upstream, '-b', branch_name)
+    existing_branches.add(branch_name)
     return True
 
 
@@ -75,18 +81,20 @@ def AddUploadedByGitClSplitToDescription(description):
     no footers.
     """
     split_footers = git_footers.split_footers(description)
-    lines = split_footers[0]
+    lines = list(split_footers[0])
     if lines[-1] and not lines[-1].isspace():
-        lines = lines + ['']
-    lines = lines + ['This CL was uploaded by git cl split.']
+        lines.append('')
+    lines.append('This CL was uploaded by git cl split.')
     if split_footers[1]:
-        lines += [''] + split_footers[1]
+        lines.append('')
+        lines.extend(split_footers[1])
     return '\n'.join(lines)
 
 
 def UploadCl(refactor_branch, refactor_branch_upstream, directories, files,
              description, comment, reviewers, changelist, cmd_upload,
-             cq_dry_run, enable_auto_submit, topic, repository_root):
+             cq_dry_run, enable_auto_submit, topic, repository_root,
+             existing_branches):
     """Uploads a CL with all changes to |files| in |refactor_branch|.
 
     Args:
@@ -103,28 +111,43 @@ def UploadCl(refactor_branch, refactor_branch_upstream, directories, files,
         cq_dry_run: If CL uploads should also do a cq dry run.
         enable_auto_submit: If CL uploads should also enable auto submit.
         topic: Topic to associate with uploaded CLs.
+        repository_root: Absolute path of the repository root.
+        existing_branches: Set of local branch names. Updated with the branch
+            created for this CL.
     """
     # Create a branch.
     if not CreateBranchForDirectories(refactor_branch, directories,
-                                      refactor_branch_upstream):
+                                      refactor_branch_upstream,
+                                      existing_branches):
         print('Skipping ' + FormatDirectoriesForPrinting(directories) +
               ' for which a branch already exists.')
         return
 
-    # Checkout all changes to files in |files|.
+    # Checkout all changes to files in |files|. Make the root absolute once so
+    # that the per-file paths only need normalizing.
+    repository_root = os.path.abspath(repository_root)
     deleted_files = []
     modified_files = []
     for action, f in files:
-        abspath = os.path.abspath(os.path.join(repository_root, f))
+        abspath = os.path.normpath(os.path.join(repository_root, f))
         if action == 'D':
             deleted_files.append(abspath)
         else:
             modified_files.append(abspath)
 
+    # Paths are passed on stdin rather than on the command line so that large
+    # CLs don't run into the argument length limit.
     if deleted_files:
-        git.run(*['rm'] + deleted_files)
+        git.run('rm',
+                '--pathspec-from-file',
+                '-',
+                indata='\n'.join(deleted_files).encode('utf-8'))
     if modified_files:
-        git.run(*['checkout', refactor_branch, '--'] + modified_files)
+        git.run('checkout',
+                refactor_branch,
+                '--pathspec-from-file',
+                '-',
+                indata='\n'.join(modified_files).encode('utf-8'))
 
     # Commit changes. The temporary file is created with delete=False so that it
     # can be deleted manually after git has read it rather than automatically
@@ -169,26 +192,32 @@ def GetFilesSplitByOwners(files, max_depth):
         A map where keys are paths to directories containing an OWNERS file and
         values are lists of files sharing an OWNERS file.
     """
-    files_split_by_owners = {}
+    files_split_by_owners = collections.defaultdict(list)
+    # Maps directories to whether they contain an OWNERS file, so that each
+    # directory is only checked once.
+    has_owners_file = {}
     for action, path in files:
         # normpath() is important to normalize separators here, in prepration
         # for str.split() before. It would be nicer to use something like
         # pathlib here but alas...
         dir_with_owners = os.path.normpath(os.path.dirname(path))
         if max_depth >= 1:
-            dir_with_owners = os.path.join(
-                *dir_with_owners.split(os.path.sep)[:max_depth])
+            dir_with_owners = os.path.sep.join(
+                dir_with_owners.split(os.path.sep, max_depth)[:max_depth])
         # Find the closest parent directory with an OWNERS file.
-        while (dir_with_owners not in files_split_by_owners
-               and not os.path.isfile(os.path.join(dir_with_owners, 'OWNERS'))):
+        while dir_with_owners not in files_split_by_owners:
+            if dir_with_owners not in has_owners_file:
+                has_owners_file[dir_with_owners] = os.path.isfile(
+                    os.path.join(dir_with_owners, 'OWNERS'))
+            if has_owners_file[dir_with_owners]:
+                break
             dir_with_owners = os.path.dirname(dir_with_owners)
-        files_split_by_owners.setdefault(dir_with_owners, []).append(
-            (action, path))
+        files_split_by_owners[dir_with_owners].append((action, path))
     return files_split_by_owners
 
 
-def PrintClInfo(cl_index, num_cls, directories, file_paths, description,
-                reviewers, cq_dry_run, enable_auto_submit, topic):
+def PrintClInfo(cl_index, num_cls, directories, files, description, reviewers,
+                cq_dry_run, enable_auto_submit, topic):
     """Prints info about a CL.
 
     Args:
@@ -196,7 +225,7 @@ def PrintClInfo(cl_index, num_cls, directories, file_paths, description,
         num_cls: The total number of CLs that will be uploaded.
         directories: Paths to directories that contains the OWNERS files for
             which to upload a CL.
-        file_paths: A list of files in this CL.
+        files: A list of (action, path) tuples for the files in this CL.
         description: The CL description.
         reviewers: A set of reviewers for this CL.
         cq_dry_run: If the CL should also be sent to CQ dry run.
@@ -214,7 +243,7 @@ def PrintClInfo(cl_index, num_cls, directories, file_paths, description,
     print('CQ Dry Run: {}'.format(cq_dry_run))
     print('Topic: {}'.format(topic))
     print('\n' + indented_description + '\n')
-    print('\n'.join(file_paths))
+    print('\n'.join(f for _, f in files))
     print()
 
 
@@ -287,32 +316,39 @@ def SplitCl(description_file, comment_file, changelist, cmd_upload, dry_run,
             if answer.lower() != 'y':
                 return 0
 
+        # Query the local branches once rather than once per CL. A dry run
+        # creates no branches, so it doesn't need them.
+        existing_branches = (set() if dry_run else
+                             set(git.branches(use_limit=False)))
         cls_per_reviewer = collections.defaultdict(int)
+        # CLs are uploaded one at a time: `git cl upload` and the comment
+        # posted afterwards both act on the checked out branch, so uploads
+        # can't overlap with creating the next CL's branch.
         for cl_index, (reviewers, cl_info) in \
             enumerate(files_split_by_reviewers.items(), 1):
             # Convert reviewers from tuple to set.
             reviewer_set = set(reviewers)
             if dry_run:
-                file_paths = [f for _, f in cl_info.files]
                 PrintClInfo(cl_index, num_cls, cl_info.owners_directories,
-                            file_paths, description, reviewer_set, cq_dry_run,
-                            enable_auto_submit, topic)
+                            cl_info.files, description, reviewer_set,
+                            cq_dry_run, enable_auto_submit, topic)
             else:
                 UploadCl(refactor_branch, refactor_branch_upstream,
                          cl_info.owners_directories, cl_info.files, description,
                          comment, reviewer_set, changelist, cmd_upload,
-                         cq_dry_run, enable_auto_submit, topic, repository_root)
+                         cq_dry_run, enable_auto_submit, topic, repository_root,
+                         existing_branches)
 
             for reviewer in reviewers:
                 cls_per_reviewer[reviewer] += 1
 
         # List the top reviewers that will be sent the most CLs as a result of
         # the split.
-        reviewer_rankings = sorted(cls_per_reviewer.items(),
-                                   key=lambda item: item[1],
-                                   reverse=True)
+        reviewer_rankings = heapq.nlargest(CL_SPLIT_TOP_REVIEWERS,
+                                           cls_per_reviewer.items(),
+                                           key=lambda item: item[1])
         print('The top reviewers are:')
-        for reviewer, count in reviewer_rankings[:CL_SPLIT_TOP_REVIEWERS]:
+        for reviewer, count in reviewer_rankings:
             print(f'    {reviewer}: {count} CLs')
 
         # Go back to the original branch.
@@ -333,10 +369,8 @@ def CheckDescriptionBugLink(description):
 
     Prompts user if the description does not contain a bug link.
     """
-    bug_pattern = re.compile(r"^Bug:\s*(?:[a-zA-Z]+:)?[0-9]+", re.MULTILINE)
-    matches = re.findall(bug_pattern, description)
     answer = 'y'
-    if not matches:
+    if not BUG_LINK_PATTERN.search(description):
         answer = gclient_utils.AskForData(
             'Description does not include a bug link. Proceed? (y/n):')
     return answer.lower() == 'y'
@@ -354,18 +388,27 @@ def SelectReviewersForFiles(cl, author, files, max_depth):
     """
     info_split_by_owners = GetFilesSplitByOwners(files, max_depth)
 
+    # Look up the owners of all files at once rather than per directory.
+    reviewers_by_directory = cl.owners_client.BatchSuggestOwners(
+        {
+            directory: [f for _, f in split_files]
+            for directory, split_files in info_split_by_owners.items()
+        },
+        exclude=[author, cl.owners_client.EVERYONE])
+
     info_split_by_reviewers = {}
 
     for (directory, split_files) in info_split_by_owners.items():
-        # Use '/' as a path separator in the branch name and the CL description
-        # and comment.
-        directory = directory.replace(os.path.sep, '/')
-        file_paths = [f for _, f in split_files]
         # Convert reviewers list to tuple in order to use reviewers as key to
-        # dictionary.
+        # dictionary. The same reviewers show up for many directories, so
+        # intern them to make comparing keys cheap.
         reviewers = tuple(
-            cl.owners_client.SuggestOwners(
-                file_paths, exclude=[author, cl.owners_client.EVERYONE]))
+            sys.intern(reviewer)
+            for reviewer in reviewers_by_directory[directory])
+        # Use '/' as a path separator in the branch name and the CL description
+        # and comment.
+        if os.path.sep != '/':
+            directory = directory.replace(os.path.sep, '/')
 
         if not reviewers in info_split_by_reviewers:
             info_split_by_reviewers[reviewers] = FilesAndOwnersDirectory([], [])
@@ -27,6 +27,19 @@ class CalledProcessError(subprocess.CalledProcessError):
         self.stdout = self.output  # for backward compatibility.
         self.stderr = stderr
         self.cwd = cwd
+        # Maps attribute names to (value, decoded value), so that large outputs
+        # are only decoded once however many times the error is formatted.
+        self._decoded = {}
+
+    def _decode(self, name):
+        value = getattr(self, name)
+        cached = self._decoded.get(name)
+        if cached is None or cached[0] is not value:
+            text = value
+            if isinstance(value, bytes):
+                text = value.decode('utf-8', 'ignore')
+            cached = self._decoded[name] = (value, text)
+        return cached[1]
 
     def __str__(self):
         out = 'Command %r returned non-zero exit status %s' % (' '.join(
@@ -34,9 +47,9 @@ class CalledProcessError(subprocess.CalledProcessError):
         if self.cwd:
             out += ' in ' + self.cwd
         if self.stdout:
-            out += '\n' + self.stdout.decode('utf-8', 'ignore')
+            out += '\n' + self._decode('stdout')
         if self.stderr:
-            out += '\n' + self.stderr.decode('utf-8', 'ignore')
+            out += '\n' + self._decode('stderr')
         return out
 
 
@@ -70,20 +83,17 @@ def get_english_env(env):
     env = env or os.environ
 
     # Test if it is necessary at all.
-    is_english = lambda name: env.get(name, 'en').startswith('en')
-
-    if is_english('LANG') and is_english('LANGUAGE'):
+    non_english = [
+        name for name in ('LANG', 'LANGUAGE')
+        if not env.get(name, 'en').startswith('en')
+    ]
+    if not non_english:
         return None
 
     # Requires modifications.
     env = env.copy()
-
-    def fix_lang(name):
-        if not is_english(name):
-            env[name] = 'en_US.UTF-8'
-
-    fix_lang('LANG')
-    fix_lang('LANGUAGE')
+    for name in non_english:
+        env[name] = 'en_US.UTF-8'
     return env
 
 
@@ -115,16 +125,19 @@ class Popen(subprocess.Popen):
             kwargs['env'] = env
         if kwargs.get('env') is not None:
             # Subprocess expects environment variables to be strings in Python
-            # 3.
+            # 3. Only copy the environment if something needs converting.
             def ensure_str(value):
                 if isinstance(value, bytes):
                     return value.decode()
                 return value
 
-            kwargs['env'] = {
-                ensure_str(k): ensure_str(v)
-                for k, v in kwargs['env'].items()
-            }
+            if any(
+                    isinstance(k, bytes) or isinstance(v, bytes)
+                    for k, v in kwargs['env'].items()):
+                kwargs['env'] = {
+                    ensure_str(k): ensure_str(v)
+                    for k, v in kwargs['env'].items()
+                }
         if kwargs.get('shell') is None:
             # *Sigh*:  Windows needs shell=True, or else it won't search %PATH%
             # for the executable, but shell=True makes subprocess on Linux fail
@@ -132,15 +145,17 @@ class Popen(subprocess.Popen):
             # first item in the list.
             kwargs['shell'] = bool(sys.platform == 'win32')
 
-        if isinstance(args, (str, bytes)):
-            tmp_str = args
-        elif isinstance(args, (list, tuple)):
-            tmp_str = ' '.join(args)
-        else:
+        if not isinstance(args, (str, bytes, list, tuple)):
             raise CalledProcessError(None, args, kwargs.get('cwd'), None, None)
-        if kwargs.get('cwd', None):
-            tmp_str += ';  cwd=%s' % kwargs['cwd']
-        logging.debug(tmp_str)
+        # Only build the log message when it will actually be emitted.
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            if isinstance(args, (str, bytes)):
+                tmp_str = args
+            else:
+                tmp_str = ' '.join(args)
+            if kwargs.get('cwd', None):
+                tmp_str += ';  cwd=%s' % kwargs['cwd']
+            logging.debug(tmp_str)
 
         try:
             with self.popen_lock:
@@ -5,168 +5,115 @@
 # found in the LICENSE file.
 """Unit tests for git_cl.py."""
 
+import functools
+import itertools
 import logging
 import os
 import sys
 import unittest
-from typing import Iterable
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEPOT_TOOLS = os.path.dirname(os.path.dirname(__file__))
+if DEPOT_TOOLS not in sys.path:
+    sys.path.insert(0, DEPOT_TOOLS)
 
 import git_auth
 import scm
 import scm_mock
 
+_REMOTE_URL = 'https://chromium.googlesource.com/chromium/tools/depot_tools.git'
+
+_NEW_AUTH = git_auth.ConfigMode.NEW_AUTH
+_NEW_AUTH_SSO = git_auth.ConfigMode.NEW_AUTH_SSO
+_NO_AUTH = git_auth.ConfigMode.NO_AUTH
+
+# Canonicalized (lower-cased) config keys written by ConfigChanger.
+_CRED_HELPER_KEY = 'credential.https://chromium.googlesource.com/.helper'
+_COOKIE_FILE_KEY = 'http.cookiefile'
+_SSO_ALLOW_KEY = 'protocol.sso.allow'
+_SSO_INSTEADOF_KEY = 'url.sso://chromium/.insteadof'
+
+# Expected config after applying each mode to '/some/fake/dir'. These are
+# shared by several cases, so they must not be modified.
+_WANT_NEW_AUTH = {
+    '/some/fake/dir': {
+        _CRED_HELPER_KEY: ['', 'luci'],
+        _COOKIE_FILE_KEY: [''],
+    },
+}
+_WANT_NEW_AUTH_SSO = {
+    '/some/fake/dir': {
+        _SSO_ALLOW_KEY: ['always'],
+        _SSO_INSTEADOF_KEY: ['https://chromium.googlesource.com/'],
+        _COOKIE_FILE_KEY: [''],
+    },
+}
+_WANT_NO_AUTH = {
+    '/some/fake/dir': {},
+}
+_WANT_BY_MODE = {
+    _NEW_AUTH: _WANT_NEW_AUTH,
+    _NEW_AUTH_SSO: _WANT_NEW_AUTH_SSO,
+    _NO_AUTH: _WANT_NO_AUTH,
+}
+
+# Expected global config after applying each mode globally.
+_WANT_GLOBAL_NEW_AUTH = {
+    _CRED_HELPER_KEY: ['', 'luci'],
+}
+_WANT_GLOBAL_NEW_AUTH_SSO = {
+    _SSO_ALLOW_KEY: ['always'],
+    _SSO_INSTEADOF_KEY: ['https://chromium.googlesource.com/'],
+}
+_WANT_GLOBAL_BY_MODE = {
+    _NEW_AUTH: _WANT_GLOBAL_NEW_AUTH,
+    _NEW_AUTH_SSO: _WANT_GLOBAL_NEW_AUTH_SSO,
+}
+
+
+@functools.cache
+def _changer(mode: git_auth.ConfigMode) -> git_auth.ConfigChanger:
+    """Returns a ConfigChanger for _REMOTE_URL in the given mode.
+
+    ConfigChangers hold no per-test state (config is written through the
+    scm_mock fakes), so one instance per mode is shared by all tests.
+    """
+    return git_auth.ConfigChanger(mode=mode, remote_url=_REMOTE_URL)
+
 
 class TestConfigChanger(unittest.TestCase):
 
     def setUp(self):
-        self._global_state_view: Iterable[tuple[str,
-                                                list[str]]] = scm_mock.GIT(self)
-
-    @property
-    def global_state(self):
-        return dict(self._global_state_view)
-
-    def test_apply_new_auth(self):
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        want = {
-            '/some/fake/dir': {
-                'credential.https://chromium.googlesource.com/.helper':
-                ['', 'luci'],
-                'http.cookiefile': [''],
-            },
-        }
-        self.assertEqual(scm.GIT._dump_config_state(), want)
-
-    def test_apply_new_auth_sso(self):
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH_SSO,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        want = {
-            '/some/fake/dir': {
-                'protocol.sso.allow': ['always'],
-                'url.sso://chromium/.insteadof':
-                ['https://chromium.googlesource.com/'],
-                'http.cookiefile': [''],
-            },
-        }
-        self.assertEqual(scm.GIT._dump_config_state(), want)
-
-    def test_apply_no_auth(self):
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NO_AUTH,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        want = {
-            '/some/fake/dir': {},
-        }
-        self.assertEqual(scm.GIT._dump_config_state(), want)
-
-    def test_apply_chain_sso_new(self):
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH_SSO,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        want = {
-            '/some/fake/dir': {
-                'credential.https://chromium.googlesource.com/.helper':
-                ['', 'luci'],
-                'http.cookiefile': [''],
-            },
-        }
-        self.assertEqual(scm.GIT._dump_config_state(), want)
-
-    def test_apply_chain_new_sso(self):
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH_SSO,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        want = {
-            '/some/fake/dir': {
-                'protocol.sso.allow': ['always'],
-                'url.sso://chromium/.insteadof':
-                ['https://chromium.googlesource.com/'],
-                'http.cookiefile': [''],
-            },
-        }
-        self.assertEqual(scm.GIT._dump_config_state(), want)
-
-    def test_apply_chain_new_no(self):
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NO_AUTH,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        want = {
-            '/some/fake/dir': {},
-        }
-        self.assertEqual(scm.GIT._dump_config_state(), want)
-
-    def test_apply_chain_sso_no(self):
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH_SSO,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NO_AUTH,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply('/some/fake/dir')
-        want = {
-            '/some/fake/dir': {},
-        }
-        self.assertEqual(scm.GIT._dump_config_state(), want)
-
-    def test_apply_global_new_auth(self):
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply_global('/some/fake/dir')
-        want = {
-            'credential.https://chromium.googlesource.com/.helper':
-            ['', 'luci'],
-        }
-        self.assertEqual(self.global_state, want)
-
-    def test_apply_global_new_auth_sso(self):
-        git_auth.ConfigChanger(
-            mode=git_auth.ConfigMode.NEW_AUTH_SSO,
-            remote_url=
-            'https://chromium.googlesource.com/chromium/tools/depot_tools.git',
-        ).apply_global('/some/fake/dir')
-        want = {
-            'protocol.sso.allow': ['always'],
-            'url.sso://chromium/.insteadof':
-            ['https://chromium.googlesource.com/'],
-        }
-        self.assertEqual(self.global_state, want)
+        self.global_config: dict[str, list[str]] = {}
+        scm_mock.GIT(self, global_config=self.global_config)
+
+    def _reset_config(self):
+        """Clears all fake git config written by a previous case."""
+        scm.GIT.drop_config_cache()
+        self.global_config.clear()
+
+    def test_apply(self):
+        for mode, want in _WANT_BY_MODE.items():
+            with self.subTest(mode.name):
+                self._reset_config()
+                _changer(mode).apply('/some/fake/dir')
+                self.assertEqual(scm.GIT._dump_config_state(), want)
+
+    def test_apply_chain(self):
+        # Applying a mode fully replaces whatever an earlier mode configured.
+        for first, second in itertools.permutations(_WANT_BY_MODE, 2):
+            with self.subTest(f'{first.name} then {second.name}'):
+                self._reset_config()
+                _changer(first).apply('/some/fake/dir')
+                _changer(second).apply('/some/fake/dir')
+                self.assertEqual(scm.GIT._dump_config_state(),
+                                 _WANT_BY_MODE[second])
+
+    def test_apply_global(self):
+        for mode, want in _WANT_GLOBAL_BY_MODE.items():
+            with self.subTest(mode.name):
+                self._reset_config()
+                _changer(mode).apply_global('/some/fake/dir')
+                self.assertEqual(self.global_config, want)
 
 
 if __name__ == '__main__':
@@ -228,6 +228,36 @@ class OwnersClientTest(unittest.TestCase):
         # owners.
         self.assertSuggestsOwners({str(x): [str(x)] for x in range(100)})
 
+    def testBatchSuggestOwners(self):
+        self.client.owners_by_path = {
+            'a': [alice],
+            'ab': [alice, bob],
+            'b': [bob],
+            'bc': [bob, chris],
+        }
+        self.client.ListOwners = mock.Mock(
+            side_effect=self.client.ListOwners)
+
+        self.assertEqual(
+            {
+                'a': [alice],
+                'ab': [alice],
+                'b': [bob],
+                'abc': [alice, bob],
+                'none': [],
+            },
+            self.client.BatchSuggestOwners(
+                {
+                    'a': ['a'],
+                    'ab': ['a', 'ab'],
+                    'b': ['b'],
+                    'abc': ['a', 'bc'],
+                    'none': [],
+                },
+                exclude=[chris]))
+        # Each path is only listed once.
+        self.assertEqual(4, self.client.ListOwners.call_count)
+
     def testBatchListOwners(self):
         self.client.owners_by_path = {
             'bar/everyone/foo.txt': [alice, bob],
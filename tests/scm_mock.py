@@ -22,7 +22,8 @@ def GIT(
     test: unittest.TestCase,
     *,
     branchref: str | None = None,
-    system_config: dict[str, list[str]] | None = None
+    system_config: dict[str, list[str]] | None = None,
+    global_config: dict[str, list[str]] | None = None
 ) -> Iterable[tuple[str, list[str]]]:
     """Installs fakes/mocks for scm.GIT so that:
 
@@ -35,13 +36,17 @@ def GIT(
     git-config which will be visible as the immutable base configuration layer
     for all git config scopes.
 
+    If provided, `global_config` is used as the mutable 'global' scoped
+    git-config instead of a new empty dict, so the caller can reset it between
+    cases without installing the fakes again.
+
     NOTE: The dependency on git_new_branch.create_new_branch seems pretty
     circular - this functionality should probably move to scm.GIT?
     """
     _branchref = [branchref or 'refs/heads/main']
 
     global_lock = threading.Lock()
-    global_state = {}
+    global_state = global_config if global_config is not None else {}
 
     def _newBranch(branchref):
         _branchref[0] = branchref
@@ -55,6 +55,12 @@ class SplitClTest(unittest.TestCase):
             return ["superowner"]
         return self.GetDirectoryBaseName(paths[0]).split(",")
 
+    def MockBatchSuggestOwners(self, paths_by_key, exclude=None):
+        return {
+            key: self.MockSuggestOwners(paths, exclude)
+            for key, paths in paths_by_key.items()
+        }
+
     def MockIsFile(self, file_path):
         if os.path.basename(file_path) == "OWNERS":
             return "owner" in self.GetDirectoryBaseName(file_path)
@@ -65,8 +71,8 @@ class SplitClTest(unittest.TestCase):
     def testSelectReviewersForFiles(self, mock_is_file):
         mock_is_file.side_effect = self.MockIsFile
 
-        owners_client = mock.Mock(SuggestOwners=self.MockSuggestOwners,
-                                  EVERYONE="*")
+        owners_client = mock.Mock(
+            BatchSuggestOwners=self.MockBatchSuggestOwners, EVERYONE="*")
         cl = mock.Mock(owners_client=owners_client)
 
         files = [("M", os.path.join("foo", "owner1,owner2", "a.txt")),
@@ -95,12 +101,40 @@ class SplitClTest(unittest.TestCase):
                          [("M", os.path.join("baz", "owner3", "e.txt"))])
         self.assertEqual(info3.owners_directories, ["baz/owner3"])
 
+    @mock.patch("os.path.isfile")
+    def testGetFilesSplitByOwnersChecksDirectoriesOnce(self, mock_is_file):
+        mock_is_file.side_effect = self.MockIsFile
+
+        files = [("M", os.path.join("owner0", "bar", "owner1", "a.txt")),
+                 ("M", os.path.join("owner0", "bar", "baz", "b.txt")),
+                 ("M", os.path.join("owner0", "bar", "baz", "c.txt")),
+                 ("D", os.path.join("owner0", "bar", "qux", "d.txt"))]
+
+        files_split_by_owners = split_cl.GetFilesSplitByOwners(files, 0)
+
+        self.assertEqual(
+            files_split_by_owners, {
+                os.path.join("owner0", "bar", "owner1"): files[:1],
+                "owner0": files[1:],
+            })
+        checked_paths = [c.args[0] for c in mock_is_file.call_args_list]
+        self.assertEqual(len(checked_paths), len(set(checked_paths)))
+
+    @mock.patch("os.path.isfile", return_value=True)
+    def testGetFilesSplitByOwnersMaxDepth(self, _mock_is_file):
+        files = [("M", os.path.join("a", "b", "c", "d.txt")),
+                 ("M", os.path.join("a", "b", "e.txt")),
+                 ("M", os.path.join("a", "f.txt"))]
+
+        self.assertEqual(split_cl.GetFilesSplitByOwners(files, 2), {
+            os.path.join("a", "b"): files[:2],
+            "a": files[2:],
+        })
+
     class UploadClTester:
         """Sets up test environment for testing split_cl.UploadCl()"""
         def __init__(self, test):
-            self.mock_git_branches = self.StartPatcher("git_common.branches",
-                                                       test)
-            self.mock_git_branches.return_value = []
+            self.existing_branches = set()
             self.mock_git_current_branch = self.StartPatcher(
                 "git_common.current_branch", test)
             self.mock_git_current_branch.return_value = "branch_to_upload"
@@ -121,7 +155,7 @@ class SplitClTest(unittest.TestCase):
             split_cl.UploadCl("branch_to_upload", "upstream_branch",
                               directories, files, "description", None,
                               reviewers, mock.Mock(), cmd_upload, True, True,
-                              "topic", os.path.sep)
+                              "topic", os.path.sep, self.existing_branches)
 
     def testUploadCl(self):
         """Tests commands run by UploadCl."""
@@ -142,9 +176,17 @@ class SplitClTest(unittest.TestCase):
         mock_git_run.assert_has_calls([
             mock.call("checkout", "-t", "upstream_branch", "-b",
                       "branch_to_upload_dir0_split"),
-            mock.call("rm", os.path.join(abs_repository_path, "foo", "b.cc")),
-            mock.call("checkout", "branch_to_upload", "--",
-                      os.path.join(abs_repository_path, "bar", "a.cc")),
+            mock.call("rm",
+                      "--pathspec-from-file",
+                      "-",
+                      indata=os.path.join(abs_repository_path, "foo",
+                                          "b.cc").encode("utf-8")),
+            mock.call("checkout",
+                      "branch_to_upload",
+                      "--pathspec-from-file",
+                      "-",
+                      indata=os.path.join(abs_repository_path, "bar",
+                                          "a.cc").encode("utf-8")),
             mock.call("commit", "-F", "temporary_file0")
         ])
 
@@ -159,9 +201,8 @@ class SplitClTest(unittest.TestCase):
         """Tests that a CL is not uploaded if split branch already exists"""
 
         upload_cl_tester = self.UploadClTester(self)
-        upload_cl_tester.mock_git_branches.return_value = [
-            "branch0", "branch_to_upload_dir0_split"
-        ]
+        upload_cl_tester.existing_branches.update(
+            ["branch0", "branch_to_upload_dir0_split"])
 
         directories = ["dir0"]
         files = [("M", os.path.join("bar", "a.cc")),
@@ -174,6 +215,24 @@ class SplitClTest(unittest.TestCase):
         upload_cl_tester.mock_git_run.assert_not_called()
         mock_cmd_upload.assert_not_called()
 
+    @mock.patch("git_common.run")
+    def testCreateBranchForDirectoriesUpdatesExistingBranches(
+            self, mock_git_run):
+        existing_branches = {"branch0"}
+
+        self.assertTrue(
+            split_cl.CreateBranchForDirectories("prefix", ["dir0"], "upstream",
+                                                existing_branches))
+        self.assertEqual(existing_branches, {"branch0", "prefix_dir0_split"})
+
+        # A second CL for the same directory is skipped without listing the
+        # branches again.
+        self.assertFalse(
+            split_cl.CreateBranchForDirectories("prefix", ["dir0"], "upstream",
+                                                existing_branches))
+        mock_git_run.assert_called_once_with("checkout", "-t", "upstream",
+                                             "-b", "prefix_dir0_split")
+
     @mock.patch("gclient_utils.AskForData")
     def testCheckDescriptionBugLink(self, mock_ask_for_data):
         # Description contains bug link.
@@ -77,6 +77,13 @@ class DefaultsTest(unittest.TestCase):
                 'LANG': 'bar',
                 'LANGUAGE': 'baz'
             }))
+            self.assertEqual({
+                'LANG': 'en_XX',
+                'LANGUAGE': 'en_US.UTF-8'
+            }, subprocess2.get_english_env({
+                'LANG': 'en_XX',
+                'LANGUAGE': 'baz'
+            }))
 
     @mock.patch('subprocess2.communicate')
     def test_check_output_defaults(self, mockCommunicate):
@@ -94,6 +101,12 @@ class DefaultsTest(unittest.TestCase):
                                      env={'key': 'value'},
                                      shell=mock.ANY)
 
+    @mock.patch('subprocess.Popen.__init__')
+    def test_env_str_not_copied(self, mockPopen):
+        env = {'key': 'value'}
+        subprocess2.Popen(['foo'], env=env)
+        self.assertIs(env, mockPopen.call_args.kwargs['env'])
+
 
 def _run_test(with_subprocess=True):
     """Runs a tests in 12 combinations:
@@ -156,6 +169,25 @@ class SmokeTests(unittest.TestCase):
         self.assertIn(e.exception.stdout.decode('utf-8', 'ignore'),
                       exception_str)
 
+    def test_print_exception_decoded_once(self):
+        decode_calls = []
+
+        class CountingBytes(bytes):
+            def decode(self, *args, **kwargs):
+                decode_calls.append(self)
+                return super().decode(*args, **kwargs)
+
+        e = subprocess2.CalledProcessError(1, ['foo'], None,
+                                           CountingBytes(b'out'), 'err')
+        for _ in range(2):
+            self.assertEqual(
+                'Command \'foo\' returned non-zero exit status 1\nout\nerr',
+                str(e))
+        self.assertEqual(1, len(decode_calls))
+
+        e.stdout = b'new out'
+        self.assertIn('new out', str(e))
+
     @_run_test()
     def test_check_output_throw_stdout(self, c, cmd, un, subp):
         with self.assertRaises(subp.CalledProcessError) as e: